@@ -5,13 +5,14 @@ Main Streamlit application for RAG Chatbot.
 import streamlit as st
 
 from config import PAGE_TITLE, PAGE_ICON
-from llm.chain import create_chain, format_chat_history
+from llm.chain import create_chain, format_chat_history, PrefillStatsHandler
 from ui.ui import (
     render_sidebar,
     initialize_chat_history,
     display_chat_history,
     get_user_input,
     display_user_message,
+    display_prefill_stats,
     get_assistant_message_placeholder
 )
 
@@ -53,19 +54,27 @@ if question := get_user_input():
     
     with st.chat_message("assistant"):
         message_placeholder = st.empty()
+        assistant_message = {"role": "assistant"}
         
         if chain:
-            # Update chat history before generating response
-            chat_history = format_chat_history(st.session_state.messages)
+            # Update chat history before generating response, leaving out the
+            # current question so the history only ever grows by appending
+            chat_history = format_chat_history(st.session_state.messages[:-1])
             # Create a fresh chain with updated history
             current_chain = create_chain(chat_history)
             
             if current_chain:
+                prefill_stats = PrefillStatsHandler()
                 full_response = ""
-                for chunk in current_chain.stream(question):
+                for chunk in current_chain.stream(question, config={"callbacks": [prefill_stats]}):
                     full_response += chunk
                     message_placeholder.markdown(full_response + "▌")
                 message_placeholder.markdown(full_response)
+                
+                if prefill_stats.prompt_tokens is not None and prefill_stats.prefill_ms is not None:
+                    assistant_message["prompt_tokens"] = prefill_stats.prompt_tokens
+                    assistant_message["prefill_ms"] = prefill_stats.prefill_ms
+                    display_prefill_stats(assistant_message)
             else:
                 full_response = "Error: No chain available"
                 message_placeholder.error("Chain not available. Please upload documents first.")
@@ -73,4 +82,5 @@ if question := get_user_input():
             full_response = "Error: No chain available"
             message_placeholder.error("Chain not available. Please upload documents first.")
         
-        st.session_state.messages.append({"role": "assistant", "content": full_response})
+        assistant_message["content"] = full_response
+        st.session_state.messages.append(assistant_message)
@@ -15,6 +15,21 @@ DB_LOCATION = os.path.join(BASE_DIR, "db", "chroma_db_generic")
 EMBEDDING_MODEL = "mxbai-embed-large"
 LLM_MODEL = "llama3.2"
 
+# Ollama session settings - keep the model loaded with a fixed context window
+# so the cached prompt prefix (instructions + history) is reused across turns
+OLLAMA_KEEP_ALIVE = "30m"
+# The whole prompt (instructions + history + ~RETRIEVER_K * CHUNK_SIZE chars of
+# context + question) must fit in LLM_NUM_CTX tokens. Past that Ollama truncates
+# the front of the prompt, the cached prefix stops matching and every turn
+# prefills the full window again - the history caps below keep it under the limit.
+LLM_NUM_CTX = 8192
+
+# Chat history limits - keep at most HISTORY_MAX_TURNS question/answer turns,
+# dropping the oldest HISTORY_DROP_TURNS at once so the cached prefix only
+# changes every HISTORY_DROP_TURNS turns instead of on every turn
+HISTORY_MAX_TURNS = 6
+HISTORY_DROP_TURNS = 4
+
 # RAG parameters
 CHUNK_SIZE = 1000
 CHUNK_OVERLAP = 200
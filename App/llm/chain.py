@@ -4,11 +4,18 @@ Handles the RAG (Retrieval-Augmented Generation) chain creation.
 """
 
 from langchain_ollama import OllamaLLM
+from langchain_core.callbacks import BaseCallbackHandler
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.runnables import RunnablePassthrough
 from langchain_core.output_parsers import StrOutputParser
 
-from config import LLM_MODEL
+from config import (
+    LLM_MODEL,
+    OLLAMA_KEEP_ALIVE,
+    LLM_NUM_CTX,
+    HISTORY_MAX_TURNS,
+    HISTORY_DROP_TURNS
+)
 from vector.vector_store import get_retriever
 
 
@@ -18,17 +25,23 @@ def format_docs(docs):
 
 
 def create_prompt_template():
-    """Create the prompt template for the RAG chain with chat history."""
+    """
+    Create the prompt template for the RAG chain with chat history.
+    
+    The stable parts (instructions, then the append-only chat history) come
+    first so Ollama can reuse the cached prefix from the previous turn.
+    Only the freshly retrieved context and the question are prefilled.
+    """
     template = """
     You are a helpful assistant. Use the provided context to answer the question.
     If the answer is not in the context, simply say you don't know.
     
-    Context:
-    {context}
-    
     Chat History:
     {chat_history}
     
+    Context:
+    {context}
+    
     Current Question: {question}
     
     Answer:
@@ -36,6 +49,37 @@ def create_prompt_template():
     return ChatPromptTemplate.from_template(template)
 
 
+def create_llm():
+    """
+    Create the Ollama LLM with pinned session options.
+    Ollama's prompt cache lives on the server: it is reused as long as the model
+    stays loaded (keep_alive), runs with the same options (num_ctx) and the new
+    prompt starts with the previous one.
+    """
+    return OllamaLLM(
+        model=LLM_MODEL,
+        keep_alive=OLLAMA_KEEP_ALIVE,
+        num_ctx=LLM_NUM_CTX
+    )
+
+
+class PrefillStatsHandler(BaseCallbackHandler):
+    """Record prompt prefill stats reported by Ollama for the last generation."""
+
+    def __init__(self):
+        self.prompt_tokens = None
+        self.prefill_ms = None
+
+    def on_llm_end(self, response, **kwargs):
+        """Read prompt_eval_count/prompt_eval_duration from the generation info."""
+        info = response.generations[0][0].generation_info or {}
+        prompt_tokens = info.get("prompt_eval_count")
+        duration_ns = info.get("prompt_eval_duration")
+        if prompt_tokens is not None and duration_ns is not None:
+            self.prompt_tokens = prompt_tokens
+            self.prefill_ms = duration_ns / 1e6
+
+
 def create_chain(chat_history=""):
     """
     Create the RAG chain with conversation memory.
@@ -49,7 +93,7 @@ def create_chain(chat_history=""):
     if not retriever:
         return None
 
-    llm = OllamaLLM(model=LLM_MODEL)
+    llm = create_llm()
     prompt = create_prompt_template()
 
     chain = (
@@ -66,6 +110,27 @@ def create_chain(chat_history=""):
     return chain
 
 
+def trim_chat_history(messages):
+    """
+    Cap chat history to HISTORY_MAX_TURNS question/answer turns.
+    
+    Old turns are dropped in blocks of HISTORY_DROP_TURNS, so the history
+    (and the cached prompt prefix) only changes every few turns.
+    
+    Args:
+        messages: List of message dictionaries, alternating user/assistant
+    
+    Returns:
+        The most recent messages, starting at a block boundary
+    """
+    turns = len(messages) // 2
+    if turns <= HISTORY_MAX_TURNS:
+        return messages
+    
+    blocks = -(-(turns - HISTORY_MAX_TURNS) // HISTORY_DROP_TURNS)
+    return messages[blocks * HISTORY_DROP_TURNS * 2:]
+
+
 def format_chat_history(messages):
     """
     Format chat history from Streamlit session state.
@@ -74,13 +139,14 @@ def format_chat_history(messages):
         messages: List of message dictionaries with 'role' and 'content' keys
     
     Returns:
-        Formatted string of chat history
+        Formatted string of chat history, empty when there are no messages
+        so later turns only append to it
     """
     if not messages:
-        return "No previous conversation."
+        return ""
     
     formatted = []
-    for msg in messages:
+    for msg in trim_chat_history(messages):
         role = "Human" if msg["role"] == "user" else "Assistant"
         formatted.append(f"{role}: {msg['content']}")
     
@@ -203,6 +203,16 @@ def display_chat_history():
     for message in st.session_state.messages:
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
+            display_prefill_stats(message)
+
+
+def display_prefill_stats(message):
+    """Display the prompt prefill stats stored on an assistant message, if any."""
+    if message.get("prompt_tokens") is not None and message.get("prefill_ms") is not None:
+        st.caption(
+            f"⏱️ Prefill: {message['prompt_tokens']} new tokens "
+            f"in {message['prefill_ms']:.0f} ms"
+        )
 
 
 def get_user_input():